@@ -11,23 +11,56 @@ Version: 1.1.0
 
 import customtkinter as ctk
 import tkinter as tk
-from tkinter import filedialog, messagebox
+from tkinter import messagebox
 import os
+import collections
+import copy
+import email.message
+import functools
+import itertools
+import queue
+import random
+import re
+import socket
 import threading
-from typing import Optional, Dict, Any, Tuple
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from typing import Optional, Dict, Any, List, Tuple
 import requests
+import urllib3
+from requests.adapters import HTTPAdapter
+from urllib3.util import Retry
 from urllib.parse import urlparse
 import time
-import tempfile
-import shutil
-import hashlib
-import json
-from datetime import datetime, timedelta
-from pathlib import Path
 
-# Set CustomTkinter appearance and color theme
-ctk.set_appearance_mode("light")
-ctk.set_default_color_theme("blue")
+# Cheap scheme + host check for validating the URL entry as the user types
+_URL_RE = re.compile(r'^https?://[^\s/?#]+', re.IGNORECASE)
+
+def _disposition_filename(content_disposition: str) -> str:
+    """Extract a safe bare filename from a Content-Disposition header"""
+    if not content_disposition:
+        return ""
+    
+    # email.message handles quoting (e.g. "a; b.txt") and RFC 2231 filename*= values
+    message = email.message.Message()
+    message['content-disposition'] = content_disposition
+    filename = message.get_filename() or ""
+    
+    # Never let the server pick a directory
+    filename = os.path.basename(filename.replace('\\', '/')).strip()
+    return "" if filename in (".", "..") else filename
+
+# Status line of a downloading row, with and without a known file size
+_STATUS_FMT = "%s / %s (%d%%) • %s/s • ETA: %s"
+_STATUS_FMT_NO_SIZE = "%s downloaded • %s/s"
+
+# Byte-size units for _format_bytes and the divisor for each
+_UNITS = ('B', 'KB', 'MB', 'GB', 'TB')
+_DIVISORS = tuple(1 << (10 * i) for i in range(len(_UNITS)))
+
+@functools.lru_cache(maxsize=256)
+def _ensure_dir(path: str) -> None:
+    """Create a directory once per process; repeat calls for the same path are free"""
+    os.makedirs(path, exist_ok=True)
 
 class TorrentLiteColors:
     """Color constants for the application"""
@@ -52,6 +85,7 @@ class ServerCapabilities:
         self.filename = ""
         self.server_info = ""
         self.last_modified = None
+        self.etag = None
         self.accept_ranges = ""
         
     def __str__(self):
@@ -62,8 +96,14 @@ class ServerCapabilities:
 class DownloadTask:
     """Enhanced download task with detailed tracking"""
     
+    SPEED_WINDOW = 10  # Speed samples averaged for the displayed speed
+    # 1/n for each possible window length, so averaging is a multiply
+    _INV_LEN = tuple(1 / n if n else 0.0 for n in range(SPEED_WINDOW + 1))
+    
     def __init__(self, url: str, save_path: str, segments: int = 1):
+        self.id = 0  # Assigned by DownloadManager.add_download
         self.url = url
+        self.url_display = url if len(url) <= 70 else url[:70] + "..."  # Truncated once for the row label
         self.save_path = save_path
         self.segments = segments
         self.status = "Pending"  # Pending, Analyzing, Downloading, Paused, Complete, Error
@@ -79,41 +119,73 @@ class DownloadTask:
         # Enhanced tracking
         self.server_capabilities = ServerCapabilities()
         self.retry_count = 0
+        self.resume_count = 0  # Dropped streams picked up again mid-file
         self.max_retries = 3
         self.last_error = None
-        self.download_history = []  # Speed history for smoother calculations
+        self.download_history = collections.deque(maxlen=self.SPEED_WINDOW)  # Recent speed samples
+        self._history_sum = 0.0
         self.pause_requested = False
         self.cancel_requested = False
+        self.future: Optional[Future] = None
+        self.chunk_size = 0  # Current read size, tuned from measured speed
+        self._bytes_lock = threading.Lock()  # Segments add to downloaded_bytes concurrently
+        self._responses: List[requests.Response] = []  # Open bodies, aborted on cancel
+        self._filename_cache: Optional[str] = None
+        self.ui_elements: Optional[Dict[str, Any]] = None  # Set once the row is built
+        self._formatted: Dict[str, Tuple[float, str]] = {}  # Last formatted size/speed strings
+        self._last_ui: Dict[str, Any] = {}  # Last values pushed to each widget
         
     def get_filename(self) -> str:
         """Extract filename from URL or path with enhanced detection"""
+        if self._filename_cache is not None:
+            return self._filename_cache
+        
         # Try to get from server capabilities first
         if self.server_capabilities.filename:
-            return self.server_capabilities.filename
+            filename = self.server_capabilities.filename
+        else:
+            # Get from save path, else extract from URL
+            filename = os.path.basename(self.save_path) or os.path.basename(urlparse(self.url).path)
             
-        # Get from save path
-        if os.path.basename(self.save_path):
-            return os.path.basename(self.save_path)
-        
-        # Extract from URL
-        parsed_url = urlparse(self.url)
-        filename = os.path.basename(parsed_url.path)
+            # If no filename in URL, generate one
+            if not filename or filename == "/":
+                filename = f"download_{int(time.time())}"
         
-        # If no filename in URL, generate one
-        if not filename or filename == "/":
-            filename = f"download_{int(time.time())}"
-            
+        self._filename_cache = filename
         return filename
     
+    def add_speed_sample(self, speed: float) -> float:
+        """Record a speed sample and return the average of the recent window in O(1)"""
+        history = self.download_history
+        if len(history) == self.SPEED_WINDOW:
+            self._history_sum -= history[0]  # About to be evicted by the append
+        history.append(speed)
+        self._history_sum += speed
+        return self._history_sum * self._INV_LEN[len(history)]
+    
     def get_temp_filename(self) -> str:
-        """Generate temporary filename"""
-        filename = self.get_filename()
-        name, ext = os.path.splitext(filename)
-        return f"{name}.torrentlite_tmp{ext}"
+        """Temporary filename next to the save path
+        
+        Derived from the save path, not the server's name, so downloads into
+        the same folder never share a temp file.
+        """
+        return os.path.basename(self.save_path) + ".part"
 
 class UIManager:
     """Enhanced UI with better feedback and controls"""
     
+    # Fonts shared by every widget and download row; created once the Tk root exists
+    FONT_TITLE = None
+    FONT_HEADING = None
+    FONT_BOLD14 = None
+    FONT_BODY14 = None
+    FONT_BODY = None
+    FONT_SMALL = None
+    FONT_ICON = None
+    
+    URL_VALIDATE_DELAY = 150  # ms of typing pause before the URL is validated
+    UI_FLUSH_INTERVAL = 40  # ms between refreshes of changed download rows
+    
     def __init__(self, download_manager):
         self.download_manager = download_manager
         self.setup_main_window()
@@ -122,10 +194,24 @@ class UIManager:
         
     def setup_main_window(self):
         """Initialize the main application window"""
+        # Set CustomTkinter appearance and color theme (here, not at import time)
+        ctk.set_appearance_mode("light")
+        ctk.set_default_color_theme("blue")
+        
         self.root = ctk.CTk()
         self.root.title("TorrentLite v1.1 - Enhanced Download Manager")
         self.root.geometry("900x700")
         self.root.minsize(800, 600)
+        self._url_after_id = None  # Pending debounced URL validation
+        
+        if UIManager.FONT_TITLE is None:
+            UIManager.FONT_TITLE = ctk.CTkFont(size=24, weight="bold")
+            UIManager.FONT_HEADING = ctk.CTkFont(size=16, weight="bold")
+            UIManager.FONT_BOLD14 = ctk.CTkFont(size=14, weight="bold")
+            UIManager.FONT_BODY14 = ctk.CTkFont(size=14)
+            UIManager.FONT_BODY = ctk.CTkFont(size=12)
+            UIManager.FONT_SMALL = ctk.CTkFont(size=10)
+            UIManager.FONT_ICON = ctk.CTkFont(size=48)
         
         # Configure grid weights for responsive design
         self.root.grid_columnconfigure(0, weight=1)
@@ -147,7 +233,7 @@ class UIManager:
         title_label = ctk.CTkLabel(
             header_frame,
             text="🚀 TorrentLite v1.1",
-            font=ctk.CTkFont(size=24, weight="bold"),
+            font=self.FONT_TITLE,
             text_color="white"
         )
         title_label.grid(row=0, column=0, pady=15)
@@ -155,7 +241,7 @@ class UIManager:
         subtitle_label = ctk.CTkLabel(
             header_frame,
             text="Enhanced Multi-Threaded Download Manager • Sprint 2",
-            font=ctk.CTkFont(size=12),
+            font=self.FONT_BODY,
             text_color="white"
         )
         subtitle_label.grid(row=1, column=0, pady=(0, 15))
@@ -173,7 +259,7 @@ class UIManager:
         self.url_entry = ctk.CTkEntry(
             input_frame,
             placeholder_text="Paste your download URL here... (http:// or https://)",
-            font=ctk.CTkFont(size=12)
+            font=self.FONT_BODY
         )
         self.url_entry.grid(row=0, column=1, columnspan=2, padx=(0, 15), pady=(15, 5), sticky="ew")
         self.url_entry.bind("<KeyRelease>", self.on_url_change)
@@ -182,7 +268,7 @@ class UIManager:
         self.url_status_label = ctk.CTkLabel(
             input_frame,
             text="",
-            font=ctk.CTkFont(size=10),
+            font=self.FONT_SMALL,
             text_color=TorrentLiteColors.TEXT_SECONDARY
         )
         self.url_status_label.grid(row=0, column=3, padx=(5, 15), pady=(15, 5))
@@ -195,7 +281,7 @@ class UIManager:
         self.save_entry = ctk.CTkEntry(
             input_frame,
             textvariable=self.save_path_var,
-            font=ctk.CTkFont(size=12)
+            font=self.FONT_BODY
         )
         self.save_entry.grid(row=1, column=1, padx=(0, 10), pady=5, sticky="ew")
         
@@ -214,14 +300,14 @@ class UIManager:
         settings_frame.grid(row=2, column=0, columnspan=4, sticky="ew", pady=(10, 15))
         settings_frame.grid_columnconfigure(4, weight=1)
         
-        # Segments selector (prepared for Sprint 3)
+        # Segments selector: parallel ranges, used for large files on servers that support them
         segments_label = ctk.CTkLabel(settings_frame, text="Segments:")
         segments_label.grid(row=0, column=0, padx=(15, 10), sticky="w")
         
-        self.segments_var = tk.StringVar(value="1")
+        self.segments_var = tk.StringVar(value=str(DownloadManager.DEFAULT_SEGMENTS))
         segments_combo = ctk.CTkComboBox(
             settings_frame,
-            values=["1"],  # Only 1 for Sprint 2
+            values=["1", "2", "4", "8", "16"],
             variable=self.segments_var,
             width=80,
             state="readonly"
@@ -249,7 +335,7 @@ class UIManager:
             command=self.start_download,
             fg_color=TorrentLiteColors.SEA_BLUE,
             hover_color="#025A8B",
-            font=ctk.CTkFont(size=14, weight="bold"),
+            font=self.FONT_BOLD14,
             height=35
         )
         self.start_btn.grid(row=0, column=5, padx=(0, 15), pady=5, sticky="e")
@@ -269,7 +355,7 @@ class UIManager:
         header_label = ctk.CTkLabel(
             header_frame,
             text="Download Progress",
-            font=ctk.CTkFont(size=16, weight="bold"),
+            font=self.FONT_HEADING,
             text_color=TorrentLiteColors.TEXT_PRIMARY
         )
         header_label.grid(row=0, column=0, padx=(15, 0), sticky="w")
@@ -277,7 +363,7 @@ class UIManager:
         self.active_downloads_label = ctk.CTkLabel(
             header_frame,
             text="Active: 0",
-            font=ctk.CTkFont(size=12),
+            font=self.FONT_BODY,
             text_color=TorrentLiteColors.TEXT_SECONDARY
         )
         self.active_downloads_label.grid(row=0, column=1, padx=(0, 15), sticky="e")
@@ -300,7 +386,7 @@ class UIManager:
         self.status_label = ctk.CTkLabel(
             footer_frame,
             text="Ready to download • Enhanced Engine v1.1",
-            font=ctk.CTkFont(size=12),
+            font=self.FONT_BODY,
             text_color=TorrentLiteColors.TEXT_SECONDARY
         )
         self.status_label.grid(row=0, column=0, padx=(10, 20), sticky="w")
@@ -309,43 +395,47 @@ class UIManager:
         self.stats_label = ctk.CTkLabel(
             footer_frame,
             text="Downloads: 0 | Total Speed: 0 KB/s | Memory: 0 MB",
-            font=ctk.CTkFont(size=12),
+            font=self.FONT_BODY,
             text_color=TorrentLiteColors.TEXT_SECONDARY
         )
         self.stats_label.grid(row=0, column=2, padx=(20, 10), sticky="e")
         
     def on_url_change(self, event):
-        """Handle URL input changes for validation"""
+        """Handle URL input changes, validating once typing pauses"""
+        if self._url_after_id is not None:
+            self.root.after_cancel(self._url_after_id)
+        self._url_after_id = self.root.after(self.URL_VALIDATE_DELAY, self._do_url_validate)
+    
+    def _do_url_validate(self):
+        """Show whether the entered URL looks valid"""
+        self._url_after_id = None
         url = self.url_entry.get().strip()
         if not url:
             self.url_status_label.configure(text="", text_color=TorrentLiteColors.TEXT_SECONDARY)
             return
         
-        try:
-            parsed = urlparse(url)
-            if parsed.scheme in ['http', 'https'] and parsed.netloc:
-                self.url_status_label.configure(text="✓ Valid", text_color=TorrentLiteColors.SUCCESS_GREEN)
-            else:
-                self.url_status_label.configure(text="⚠ Invalid", text_color=TorrentLiteColors.WARNING_ORANGE)
-        except:
-            self.url_status_label.configure(text="✗ Error", text_color=TorrentLiteColors.ERROR_RED)
+        if _URL_RE.match(url):
+            self.url_status_label.configure(text="✓ Valid", text_color=TorrentLiteColors.SUCCESS_GREEN)
+        else:
+            self.url_status_label.configure(text="⚠ Invalid", text_color=TorrentLiteColors.WARNING_ORANGE)
     
     def show_empty_state(self):
         """Show enhanced empty state"""
         empty_frame = ctk.CTkFrame(self.downloads_frame, fg_color="transparent")
         empty_frame.grid(row=0, column=0, pady=50)
+        self._empty_state_widget = empty_frame
         
         empty_icon = ctk.CTkLabel(
             empty_frame,
             text="📁",
-            font=ctk.CTkFont(size=48)
+            font=self.FONT_ICON
         )
         empty_icon.grid(row=0, column=0, pady=(0, 10))
         
         empty_text = ctk.CTkLabel(
             empty_frame,
             text="No downloads yet\nPaste a URL above to get started!\n\nSprint 2 Features:\n• Enhanced server analysis\n• Better progress tracking\n• Improved error handling",
-            font=ctk.CTkFont(size=14),
+            font=self.FONT_BODY14,
             text_color=TorrentLiteColors.TEXT_SECONDARY,
             justify="center"
         )
@@ -353,6 +443,8 @@ class UIManager:
         
     def browse_save_location(self):
         """Enhanced file dialog with better file type detection"""
+        from tkinter import filedialog  # Only needed once the user browses
+        
         current_path = self.save_path_var.get()
         
         if os.path.isdir(current_path):
@@ -409,9 +501,9 @@ class UIManager:
         
         # Check if save directory exists and is writable
         save_dir = os.path.dirname(save_path)
-        if save_dir and not os.path.exists(save_dir):
+        if save_dir:
             try:
-                os.makedirs(save_dir, exist_ok=True)
+                _ensure_dir(save_dir)
             except Exception as e:
                 messagebox.showerror("Error", f"Cannot create directory: {str(e)}")
                 return
@@ -440,14 +532,13 @@ class UIManager:
         
     def add_download_to_ui(self, task: DownloadTask):
         """Enhanced download UI with more details"""
-        # Clear empty state if this is the first download
+        # Hide the empty state on the first download; .grid() brings it back
         if len(self.download_manager.tasks) == 1:
-            for widget in self.downloads_frame.winfo_children():
-                widget.destroy()
+            self._empty_state_widget.grid_remove()
         
         # Create download item frame
         item_frame = ctk.CTkFrame(self.downloads_frame)
-        item_frame.grid(row=len(self.download_manager.tasks) - 1, column=0, sticky="ew", pady=5)
+        item_frame.grid(row=task.id, column=0, sticky="ew", pady=5)
         item_frame.grid_columnconfigure(1, weight=1)
         
         # File info header
@@ -459,7 +550,7 @@ class UIManager:
         file_label = ctk.CTkLabel(
             file_info_frame,
             text=f"📄 {filename}",
-            font=ctk.CTkFont(size=14, weight="bold"),
+            font=self.FONT_BOLD14,
             anchor="w"
         )
         file_label.grid(row=0, column=0, sticky="w")
@@ -468,17 +559,16 @@ class UIManager:
         status_indicator = ctk.CTkLabel(
             file_info_frame,
             text="🔄 Analyzing...",
-            font=ctk.CTkFont(size=12),
+            font=self.FONT_BODY,
             text_color=TorrentLiteColors.WARNING_ORANGE
         )
         status_indicator.grid(row=0, column=1, sticky="e")
         
         # URL display (truncated)
-        url_display = task.url if len(task.url) <= 70 else task.url[:70] + "..."
         url_label = ctk.CTkLabel(
             item_frame,
-            text=url_display,
-            font=ctk.CTkFont(size=10),
+            text=task.url_display,
+            font=self.FONT_SMALL,
             text_color=TorrentLiteColors.TEXT_SECONDARY,
             anchor="w"
         )
@@ -506,7 +596,7 @@ class UIManager:
         status_label = ctk.CTkLabel(
             progress_detail_frame,
             text="Preparing download...",
-            font=ctk.CTkFont(size=12),
+            font=self.FONT_BODY,
             text_color=TorrentLiteColors.TEXT_SECONDARY,
             anchor="w"
         )
@@ -516,7 +606,7 @@ class UIManager:
         server_info_label = ctk.CTkLabel(
             progress_detail_frame,
             text="Server: Unknown",
-            font=ctk.CTkFont(size=10),
+            font=self.FONT_SMALL,
             text_color=TorrentLiteColors.TEXT_SECONDARY,
             anchor="e"
         )
@@ -561,6 +651,7 @@ class UIManager:
             'pause_btn': pause_btn,
             'cancel_btn': cancel_btn
         }
+        self.download_manager._mark_dirty(task)
     
     def pause_download(self, task: DownloadTask):
         """Handle pause button (Sprint 2 - Basic implementation)"""
@@ -574,48 +665,68 @@ class UIManager:
             f"Are you sure you want to cancel downloading:\n{task.get_filename()}?"
         )
         if result:
-            task.cancel_requested = True
-            if hasattr(task, 'ui_elements'):
-                task.ui_elements['status_label'].configure(text="❌ Cancelled by user")
-                task.ui_elements['status_indicator'].configure(
+            self.download_manager.cancel(task)
+            if task.ui_elements is not None:
+                self.download_manager._set_widget(task, 'status_label', text="❌ Cancelled by user")
+                self.download_manager._set_widget(task, 'status_indicator',
                     text="❌ Cancelled",
                     text_color=TorrentLiteColors.ERROR_RED
                 )
     
     def start_ui_updater(self):
         """Enhanced UI updater with better performance"""
+        self._last_stats = None
+        
         def update_ui():
-            try:
-                # Update active downloads count
-                active_count = sum(1 for task in self.download_manager.tasks.values() 
-                                 if task.status == "Downloading")
-                self.active_downloads_label.configure(text=f"Active: {active_count}")
-                
-                # Update stats
-                total_speed = sum(task.speed for task in self.download_manager.tasks.values() 
-                                if task.status == "Downloading")
-                total_downloads = len(self.download_manager.tasks)
-                
-                # Simple memory usage estimation
-                memory_mb = total_downloads * 2  # Rough estimate
-                
-                speed_str = self.download_manager._format_bytes(total_speed) + "/s" if total_speed > 0 else "0 B/s"
-                self.stats_label.configure(
-                    text=f"Downloads: {total_downloads} | Total Speed: {speed_str} | Memory: {memory_mb} MB"
-                )
-                
-                # Update individual download UI elements
-                for task in self.download_manager.tasks.values():
-                    if hasattr(task, 'ui_elements'):
-                        self.download_manager._update_task_ui(task)
-                
-            except Exception:
-                pass  # Ignore UI update errors
+            # The after() chain ends with the window
+            if not self.root.winfo_exists():
+                return
             
-            # Schedule next update
+            # Schedule the next update first, so an error reported by Tk's
+            # callback handler does not stop the updates
             self.root.after(1000, update_ui)
+            
+            # Total up active downloads in one pass; rows refresh in _flush_ui_updates
+            manager = self.download_manager
+            active_count = 0
+            total_speed = 0.0
+            for task in manager.tasks:
+                if task.status == "Downloading":
+                    active_count += 1
+                    total_speed += task.speed
+            total_downloads = len(manager.tasks)
+            
+            # Simple memory usage estimation
+            memory_mb = total_downloads * 2  # Rough estimate
+            
+            speed_str = manager._format_bytes(total_speed) + "/s" if total_speed > 0 else "0 B/s"
+            stats = (
+                f"Active: {active_count}",
+                f"Downloads: {total_downloads} | Total Speed: {speed_str} | Memory: {memory_mb} MB"
+            )
+            
+            # Only touch the labels when the text changed
+            if stats != self._last_stats:
+                self.active_downloads_label.configure(text=stats[0])
+                self.stats_label.configure(text=stats[1])
+                self._last_stats = stats
         
         update_ui()
+        self._flush_ui_updates()
+    
+    def _flush_ui_updates(self):
+        """Refresh the rows of tasks that changed since the last flush"""
+        if not self.root.winfo_exists():
+            return
+        self.root.after(self.UI_FLUSH_INTERVAL, self._flush_ui_updates)
+        
+        # Worker messages first, then rows rebuilt from the latest task state;
+        # intermediate changes between flushes collapse into one refresh per row
+        manager = self.download_manager
+        manager._drain_ui_queue()
+        for task in manager._take_dirty():
+            if task.ui_elements is not None:
+                manager._update_task_ui(task)
     
     def update_status(self, message: str):
         """Update the footer status message"""
@@ -624,32 +735,89 @@ class UIManager:
     def run(self):
         """Start the application main loop"""
         self.root.mainloop()
+        self.download_manager.shutdown()
 
 class DownloadManager:
     """Enhanced download management with server analysis"""
     
+    CHUNK_SIZE = 256 * 1024  # first read size, before any speed is known
+    MIN_CHUNK_SIZE = 64 * 1024
+    MAX_CHUNK_SIZE = 4 * 1024 * 1024
+    WRITE_BUFFER_SIZE = 1024 * 1024
+    MAX_WORKERS = int(os.environ.get('TORRENTLITE_WORKERS', 4))
+    CAPS_TTL = 60  # seconds a server analysis stays reusable
+    PROGRESS_INTERVAL = 0.5  # seconds between speed/progress updates
+    SEGMENT_THRESHOLD = 8 * 1024 * 1024  # smaller files aren't worth extra connections
+    DEFAULT_SEGMENTS = 4  # initial choice in the Segments selector
+    MAX_SEGMENT_WORKERS = 16
+    # Enough pooled connections per host that no download or segment's keep-alive socket is discarded
+    POOL_SIZE = max(16, MAX_WORKERS + MAX_SEGMENT_WORKERS)
+    # Transient statuses worth asking again for before the request reaches our code
+    RETRY_STATUSES = (429, 500, 502, 503, 504)
+    RESUME_BACKOFF = (0.01, 0.1, 1.0, 10.0)  # seconds before each resume of a dropped stream
+    # What a dropped or stalled connection raises from inside a body read
+    STREAM_ERRORS = (requests.RequestException, urllib3.exceptions.HTTPError, OSError)
+    PROBE_TIMEOUT = (3.0, 10.0)  # (connect, read): fail fast on dead hosts
+    UI_QUEUE_BUDGET = 0.010  # seconds of queued widget changes applied per UI flush
+    PROGRESS_STEP = 0.005  # smallest progress bar move worth a redraw (under a pixel on most rows)
+    
     def __init__(self):
-        self.tasks: Dict[str, DownloadTask] = {}
+        self.tasks: List[DownloadTask] = []
+        self._next_id = itertools.count()
         self.active_downloads = 0
+        self.session = self._create_session()
+        self.pool = ThreadPoolExecutor(max_workers=self.MAX_WORKERS, thread_name_prefix='download')
+        # Separate pool so segments never wait behind the downloads that spawned them
+        self.segment_pool = ThreadPoolExecutor(max_workers=self.MAX_SEGMENT_WORKERS, thread_name_prefix='segment')
+        self._caps_cache: Dict[str, Tuple[float, ServerCapabilities]] = {}
+        # Tasks whose row needs a refresh; workers add, the UI thread drains
+        self._ui_dirty = set()
+        self._ui_dirty_lock = threading.Lock()
+        # (task, widget key, configure options) posted by workers; only the UI thread touches Tk
+        self._ui_queue = queue.SimpleQueue()
+    
+    def _create_session(self) -> requests.Session:
+        """Create a shared session so requests reuse pooled keep-alive connections"""
+        session = requests.Session()
+        # Refused connections and transient statuses are retried here, honoring Retry-After.
+        # Dropped bodies are resumed by _iter_resumable, so reads are never retried; anything
+        # that still fails falls through to _download_with_retry.
+        retries = Retry(total=3, read=0, backoff_factor=0.5, status_forcelist=self.RETRY_STATUSES,
+                        raise_on_status=False)
+        adapter = HTTPAdapter(pool_connections=self.POOL_SIZE, pool_maxsize=self.POOL_SIZE, max_retries=retries)
+        session.mount('http://', adapter)
+        session.mount('https://', adapter)
+        return session
         
     def add_download(self, task: DownloadTask):
         """Add a new download task with enhanced analysis"""
-        task_id = f"{task.url}_{int(time.time())}"
-        self.tasks[task_id] = task
-        
-        # Start download in background thread
-        download_thread = threading.Thread(
-            target=self._enhanced_download_process,
-            args=(task,),
-            daemon=True
-        )
-        download_thread.start()
+        task.id = next(self._next_id)
+        self.tasks.append(task)
+        
+        # Queue the download; at most MAX_WORKERS run at once
+        task.future = self.pool.submit(self._enhanced_download_process, task)
+    
+    def cancel(self, task: DownloadTask):
+        """Stop a download, waking any read that is blocked on a stalled connection"""
+        task.cancel_requested = True
+        with task._bytes_lock:
+            responses = list(task._responses)
+        for response in responses:
+            self._abort_response(response)
+    
+    def shutdown(self):
+        """Stop running downloads and drop queued ones"""
+        for task in self.tasks:
+            self.cancel(task)
+        self.pool.shutdown(wait=False, cancel_futures=True)
+        self.segment_pool.shutdown(wait=False, cancel_futures=True)
     
     def _enhanced_download_process(self, task: DownloadTask):
         """Enhanced download process with server analysis"""
         try:
             # Phase 1: Analyze server capabilities
             task.status = "Analyzing"
+            self._mark_dirty(task)
             self._analyze_server_capabilities(task)
             
             if task.cancel_requested:
@@ -657,18 +825,36 @@ class DownloadManager:
             
             # Phase 2: Download file
             task.status = "Downloading"
+            self._mark_dirty(task)
             self._download_with_retry(task)
             
         except Exception as e:
             task.status = "Error"
             task.error_message = str(e)
-            self._update_task_ui(task)
+            self._mark_dirty(task)
+        
+        finally:
+            # A cancelled task must not stay "Downloading", or the stats keep counting it
+            if task.cancel_requested and task.status not in ("Complete", "Error"):
+                task.status = "Paused"
+                task.speed = 0
+                self._mark_dirty(task)
     
     def _analyze_server_capabilities(self, task: DownloadTask):
         """Analyze what the server supports"""
-            # First, try a HEAD request to get file info without downloading
+        # Reuse a recent analysis of the same URL (e.g. a re-queued mirror)
+        cache_key = self._caps_key(task.url)
+        cached = self._caps_cache.get(cache_key)
+        if cached is not None and time.monotonic() - cached[0] < self.CAPS_TTL:
+            task.server_capabilities = copy.copy(cached[1])
+            task.file_size = task.server_capabilities.content_length
+            task._filename_cache = None
+            self._show_server_info(task)
+            return
+        
+        # First, try a HEAD request to get file info without downloading
         try:
-            head_response = requests.head(task.url, timeout=10, allow_redirects=True)
+            head_response = self.session.head(task.url, timeout=self.PROBE_TIMEOUT, allow_redirects=True)
             task.server_capabilities.supports_head_requests = True
             
             # Extract server information
@@ -680,21 +866,22 @@ class DownloadManager:
             task.server_capabilities.supports_range_requests = 'bytes' in task.server_capabilities.accept_ranges.lower()
             
             # Try to extract filename from Content-Disposition header
-            content_disposition = headers.get('content-disposition', '')
-            if 'filename=' in content_disposition:
-                filename = content_disposition.split('filename=')[1].strip('"\'')
+            filename = _disposition_filename(headers.get('content-disposition', ''))
+            if filename:
                 task.server_capabilities.filename = filename
+                task._filename_cache = None  # Content-Disposition wins
                 
-            # Last modified
+            # Validators, used to notice when a cached analysis goes stale
             if 'last-modified' in headers:
                 task.server_capabilities.last_modified = headers['last-modified']
+            task.server_capabilities.etag = headers.get('etag')
                 
             task.file_size = task.server_capabilities.content_length
             
         except requests.RequestException:
             # If HEAD fails, try a small GET request
             task.server_capabilities.supports_head_requests = False
-            get_response = requests.get(task.url, stream=True, timeout=10, headers={'Range': 'bytes=0-1023'})
+            get_response = self.session.get(task.url, stream=True, timeout=self.PROBE_TIMEOUT, headers={'Range': 'bytes=0-1023'})
             
             if get_response.status_code == 206:  # Partial content
                 task.server_capabilities.supports_range_requests = True
@@ -705,40 +892,60 @@ class DownloadManager:
                             task.server_capabilities.content_length = int(total_size)
                             task.file_size = int(total_size)
                 
-                get_response.close()
+                # Drain the 1 KB body so the connection goes back to the pool
+                get_response.raw.read(2048)
             
-            # Update UI with server info
-            if hasattr(task, 'ui_elements'):
-                server_info = f"Server: {task.server_capabilities.server_info}"
-                if task.server_capabilities.supports_range_requests:
-                    server_info += " | Range: ✓"
-                else:
-                    server_info += " | Range: ✗"
-                
-                task.ui_elements['server_info_label'].configure(text=server_info)
-                
-                # Update file size if known
-                if task.file_size > 0:
-                    size_str = self._format_bytes(task.file_size)
-                    task.ui_elements['status_label'].configure(
-                        text=f"File size: {size_str} • Ready to download"
-                    )
-                else:
-                    task.ui_elements['status_label'].configure(text="Size unknown • Ready to download")
-                
-                task.ui_elements['status_indicator'].configure(
-                    text="✓ Ready",
-                    text_color=TorrentLiteColors.SUCCESS_GREEN
-                )
+            get_response.close()
             
         except Exception as e:
             task.error_message = f"Server analysis failed: {str(e)}"
-            if hasattr(task, 'ui_elements'):
-                task.ui_elements['status_label'].configure(text=f"Analysis error: {str(e)}")
-                task.ui_elements['status_indicator'].configure(
+            if task.ui_elements is not None:
+                self._post_widget(task, 'status_label', text=f"Analysis error: {str(e)}")
+                self._post_widget(task, 'status_indicator',
                     text="⚠ Error",
                     text_color=TorrentLiteColors.ERROR_RED
                 )
+            return
+        
+        # Store a snapshot; the task keeps updating its own copy while it downloads
+        self._caps_cache[cache_key] = (time.monotonic(), copy.copy(task.server_capabilities))
+        self._show_server_info(task)
+    
+    def _caps_key(self, url: str) -> str:
+        """Normalize a URL for the capabilities cache"""
+        return urlparse(url)._replace(fragment='').geturl()
+    
+    def _invalidate_stale_caps(self, task: DownloadTask, headers):
+        """Forget the cached analysis if the server now reports a different version"""
+        caps = task.server_capabilities
+        if (headers.get('etag', caps.etag) != caps.etag or
+                headers.get('last-modified', caps.last_modified) != caps.last_modified):
+            self._caps_cache.pop(self._caps_key(task.url), None)
+    
+    def _show_server_info(self, task: DownloadTask):
+        """Show the analysis results on the task's row"""
+        if task.ui_elements is not None:
+            server_info = f"Server: {task.server_capabilities.server_info}"
+            if task.server_capabilities.supports_range_requests:
+                server_info += " | Range: ✓"
+            else:
+                server_info += " | Range: ✗"
+            
+            self._post_widget(task, 'server_info_label', text=server_info)
+            
+            # Update file size if known
+            if task.file_size > 0:
+                size_str = self._format_cached(task, 'size', task.file_size)
+                self._post_widget(task, 'status_label',
+                    text=f"File size: {size_str} • Ready to download"
+                )
+            else:
+                self._post_widget(task, 'status_label', text="Size unknown • Ready to download")
+            
+            self._post_widget(task, 'status_indicator',
+                text="✓ Ready",
+                text_color=TorrentLiteColors.SUCCESS_GREEN
+            )
     
     def _download_with_retry(self, task: DownloadTask):
         """Download file with retry logic"""
@@ -749,24 +956,30 @@ class DownloadManager:
             try:
                 task.retry_count = attempt
                 if attempt > 0:
-                    wait_time = min(2 ** attempt, 30)  # Exponential backoff, max 30 seconds
-                    if hasattr(task, 'ui_elements'):
-                        task.ui_elements['status_label'].configure(
-                            text=f"Retrying in {wait_time}s... (Attempt {attempt + 1}/{task.max_retries + 1})"
+                    # Exponential backoff, max 30 seconds, with ±20% jitter so tasks don't retry in lockstep
+                    wait_time = min(2 ** attempt, 30) * random.uniform(0.8, 1.2)
+                    if task.ui_elements is not None:
+                        self._post_widget(task, 'status_label',
+                            text=f"Retrying in {wait_time:.0f}s... (Attempt {attempt + 1}/{task.max_retries + 1})"
                         )
-                    time.sleep(wait_time)
+                    self._interruptible_sleep(task, wait_time)
+                    if task.cancel_requested:
+                        return
                 
                 self._perform_download(task)
+                if task.cancel_requested:
+                    return
                 
                 # If we get here, download was successful
                 task.status = "Complete"
-                if hasattr(task, 'ui_elements'):
-                    task.ui_elements['status_label'].configure(text="✅ Download completed successfully!")
-                    task.ui_elements['status_indicator'].configure(
+                task.progress = 1.0
+                self._mark_dirty(task)
+                if task.ui_elements is not None:
+                    self._post_widget(task, 'status_label', text="✅ Download completed successfully!")
+                    self._post_widget(task, 'status_indicator',
                         text="✅ Complete",
                         text_color=TorrentLiteColors.SUCCESS_GREEN
                     )
-                    task.ui_elements['progress_bar'].set(1.0)
                 return
                 
             except Exception as e:
@@ -775,173 +988,506 @@ class DownloadManager:
                     # Final attempt failed
                     task.status = "Error"
                     task.error_message = f"Download failed after {task.max_retries + 1} attempts: {str(e)}"
-                    if hasattr(task, 'ui_elements'):
-                        task.ui_elements['status_label'].configure(text=f"❌ Failed: {str(e)}")
-                        task.ui_elements['status_indicator'].configure(
+                    self._mark_dirty(task)
+                    if task.ui_elements is not None:
+                        self._post_widget(task, 'status_label', text=f"❌ Failed: {str(e)}")
+                        self._post_widget(task, 'status_indicator',
                             text="❌ Failed",
                             text_color=TorrentLiteColors.ERROR_RED
                         )
                 else:
                     # Will retry
-                    if hasattr(task, 'ui_elements'):
-                        task.ui_elements['status_label'].configure(
+                    if task.ui_elements is not None:
+                        self._post_widget(task, 'status_label',
                             text=f"Error: {str(e)} • Will retry..."
                         )
     
+    def _interruptible_sleep(self, task: DownloadTask, seconds: float):
+        """Sleep in 100 ms slices, returning early if the task is cancelled"""
+        end = time.monotonic() + seconds
+        while not task.cancel_requested:
+            remaining = end - time.monotonic()
+            if remaining <= 0:
+                return
+            time.sleep(min(remaining, 0.1))
+    
     def _perform_download(self, task: DownloadTask):
         """Perform the actual download with progress tracking"""
-        # Create temporary file
-        temp_dir = tempfile.gettempdir()
-        temp_filename = task.get_temp_filename()
-        task.temp_file = os.path.join(temp_dir, temp_filename)
+        # Create the temporary file next to the final one, so finishing is a rename
+        # on the same filesystem rather than a copy out of the system temp dir
+        final_dir = os.path.dirname(task.save_path)
+        if final_dir:
+            os.makedirs(final_dir, exist_ok=True)
+        task.temp_file = os.path.join(final_dir, task.get_temp_filename())
         
         # Start download
         task.start_time = time.time()
         task.downloaded_bytes = 0
+        task.chunk_size = self.CHUNK_SIZE
         
+        finished = False
         try:
-            response = requests.get(task.url, stream=True, timeout=30)
-            response.raise_for_status()
-            
-            # Get actual file size from response if not already known
-            if task.file_size == 0:
-                content_length = response.headers.get('content-length')
-                if content_length:
-                    task.file_size = int(content_length)
-            
-            # Download with progress tracking
-            with open(task.temp_file, 'wb') as file:
-                chunk_size = 8192  # 8KB chunks
-                last_update_time = time.time()
-                bytes_since_last_update = 0
-                
-                for chunk in response.iter_content(chunk_size=chunk_size):
-                    if task.cancel_requested:
-                        response.close()
-                        return
-                    
-                    if chunk:  # Filter out keep-alive chunks
-                        file.write(chunk)
-                        task.downloaded_bytes += len(chunk)
-                        bytes_since_last_update += len(chunk)
-                        
-                        # Update progress every 0.5 seconds
-                        current_time = time.time()
-                        if current_time - last_update_time >= 0.5:
-                            # Calculate speed
-                            time_elapsed = current_time - last_update_time
-                            current_speed = bytes_since_last_update / time_elapsed
-                            
-                            # Smooth speed calculation using history
-                            task.download_history.append(current_speed)
-                            if len(task.download_history) > 10:  # Keep last 10 measurements
-                                task.download_history.pop(0)
-                            
-                            # Average speed
-                            task.speed = sum(task.download_history) / len(task.download_history)
-                            
-                            # Calculate progress
-                            if task.file_size > 0:
-                                task.progress = task.downloaded_bytes / task.file_size
-                                
-                                # Calculate ETA
-                                if task.speed > 0:
-                                    remaining_bytes = task.file_size - task.downloaded_bytes
-                                    eta_seconds = remaining_bytes / task.speed
-                                    task.eta = self._format_time(eta_seconds)
-                                else:
-                                    task.eta = "Unknown"
-                            else:
-                                task.progress = 0
-                                task.eta = "Unknown"
-                            
-                            # Reset counters
-                            last_update_time = current_time
-                            bytes_since_last_update = 0
-            
-            response.close()
-            
-            # Move temp file to final location
-            final_dir = os.path.dirname(task.save_path)
-            if not os.path.exists(final_dir):
-                os.makedirs(final_dir, exist_ok=True)
-            
-            # Remove existing file if it exists
-            if os.path.exists(task.save_path):
-                os.remove(task.save_path)
-            
-            shutil.move(task.temp_file, task.save_path)
+            if self._use_segments(task):
+                self._download_segmented(task)
+            else:
+                self._download_single(task)
+            
+            if task.cancel_requested:
+                return
+            
+            # Move temp file to final location; os.replace atomically overwrites
+            # an existing file, so no half-finished file ever takes its name
+            os.replace(task.temp_file, task.save_path)
+            finished = True
             
             # Final progress update
             task.progress = 1.0
             task.speed = 0
             task.eta = "Complete"
             
-        except Exception as e:
-            # Clean up temp file on error
-            if task.temp_file and os.path.exists(task.temp_file):
+        finally:
+            # The preallocated temp file sits in the user's folder; don't leave it
+            # behind after an error or a cancel (including closing the window)
+            with task._bytes_lock:
+                task._responses.clear()
+            if not finished:
                 try:
                     os.remove(task.temp_file)
-                except:
-                    pass
-            raise e
+                except OSError:
+                    pass  # Never created, or already gone
+    
+    def _download_single(self, task: DownloadTask):
+        """Stream the whole file over one connection into the temp file"""
+        response = self._track_response(task, self.session.get(task.url, stream=True, timeout=30))
+        response.raise_for_status()
+        self._invalidate_stale_caps(task, response.headers)
+        
+        # Get actual file size from response if not already known
+        if task.file_size == 0:
+            content_length = response.headers.get('content-length')
+            if content_length:
+                task.file_size = int(content_length)
+        
+        # Download with progress tracking
+        with self._open_temp_file(task.temp_file, task.file_size) as file:
+            last_update_time = time.monotonic()
+            bytes_since_last_update = 0
+            chunks_since_last_update = 0
+            # Read the clock only every few chunks, about four times per interval
+            check_every = countdown = 1
+            # Per-chunk work stays in locals; task.downloaded_bytes is published at each clock check
+            write = file.write
+            downloaded = 0
+            
+            # An identity body's length is known, so a short one can be detected and resumed
+            encoding = response.headers.get('content-encoding', 'identity').lower()
+            content_length = response.headers.get('content-length')
+            end = int(content_length) - 1 if content_length and encoding in ('', 'identity') else None
+            
+            for chunk in self._iter_resumable(task, response, 0, end):
+                if task.cancel_requested:
+                    response.close()
+                    return
+                
+                if chunk:  # Filter out keep-alive chunks
+                    write(chunk)
+                    size = len(chunk)
+                    downloaded += size
+                    bytes_since_last_update += size
+                    chunks_since_last_update += 1
+                    
+                    countdown -= 1
+                    if countdown:
+                        continue
+                    countdown = check_every
+                    task.downloaded_bytes = downloaded
+                    
+                    # Update progress every 0.5 seconds
+                    current_time = time.monotonic()
+                    if current_time - last_update_time >= self.PROGRESS_INTERVAL:
+                        self._update_progress(task, bytes_since_last_update, current_time - last_update_time)
+                        check_every = countdown = max(1, chunks_since_last_update // 4)
+                        
+                        # Reset counters
+                        last_update_time = current_time
+                        bytes_since_last_update = 0
+                        chunks_since_last_update = 0
+            
+            task.downloaded_bytes = downloaded
+            # Drop any preallocated tail the body didn't fill (e.g. a decoded size mismatch)
+            file.truncate()
+        
+        response.close()
+    
+    def _use_segments(self, task: DownloadTask) -> bool:
+        """Whether the file is big enough, and the server able, to fetch in parallel ranges"""
+        return (task.segments > 1 and task.server_capabilities.supports_range_requests and
+                task.file_size >= self.SEGMENT_THRESHOLD)
+    
+    def _download_segmented(self, task: DownloadTask):
+        """Fetch byte ranges over several connections into a preallocated temp file"""
+        size = task.file_size
+        segments = min(task.segments, self.MAX_SEGMENT_WORKERS)
+        step = -(-size // segments)
+        
+        # Preallocate so each segment can write at its own offset
+        with self._open_temp_file(task.temp_file, size):
+            pass
+        
+        stop = threading.Event()  # Set when one segment fails or the server ignores ranges
+        starts = range(0, size, step)
+        futures = [
+            self.segment_pool.submit(self._download_range, task, start, min(start + step, size) - 1, len(starts), stop)
+            for start in starts
+        ]
+        
+        # The segments only count bytes; this thread turns them into speed and progress
+        last_update_time = time.monotonic()
+        last_bytes = 0
+        pending = futures
+        while pending:
+            _, pending = wait(pending, timeout=self.PROGRESS_INTERVAL)
+            if task.cancel_requested:
+                continue  # Just wait for the segments to stop; don't repaint the row as downloading
+            current_time = time.monotonic()
+            downloaded = task.downloaded_bytes
+            self._update_progress(task, downloaded - last_bytes, current_time - last_update_time)
+            last_update_time = current_time
+            last_bytes = downloaded
+        
+        # Re-raise the first segment failure so the retry logic sees it
+        for future in futures:
+            future.result()
+        
+        if not task.server_capabilities.supports_range_requests and not task.cancel_requested:
+            task.downloaded_bytes = 0
+            self._download_single(task)
+    
+    def _download_range(self, task: DownloadTask, start: int, end: int,
+                        connections: int, stop: threading.Event):
+        """Download bytes start..end (inclusive) into the temp file at their offset"""
+        try:
+            caps = task.server_capabilities
+            with self._get_range(task, start, end, self._if_range(caps.etag, caps.last_modified)) as response:
+                if not self._is_range_response(response, start):
+                    # The server sent something other than our range; fall back to one stream
+                    task.server_capabilities.supports_range_requests = False
+                    self._caps_cache.pop(self._caps_key(task.url), None)
+                    stop.set()
+                    return
+                
+                with open(task.temp_file, 'r+b', buffering=self.WRITE_BUFFER_SIZE) as file:
+                    file.seek(start)
+                    for chunk in self._iter_resumable(task, response, start, end, connections):
+                        if task.cancel_requested or stop.is_set():
+                            return
+                        file.write(chunk)
+                        with task._bytes_lock:
+                            task.downloaded_bytes += len(chunk)
+        except Exception:
+            stop.set()
+            raise
+    
+    def _get_range(self, task: DownloadTask, start: int, end: Optional[int],
+                   if_range: Optional[str] = None) -> requests.Response:
+        """Request bytes start..end (inclusive; None for the rest of the file) uncompressed
+        
+        With ``if_range``, a server whose file no longer matches that validator
+        answers 200 with the whole new file instead of a range of it.
+        """
+        headers = {'Range': f'bytes={start}-{"" if end is None else end}', 'Accept-Encoding': 'identity'}
+        if if_range:
+            headers['If-Range'] = if_range
+        response = self._track_response(task, self.session.get(task.url, stream=True, timeout=30, headers=headers))
+        response.raise_for_status()
+        return response
+    
+    def _track_response(self, task: DownloadTask, response: requests.Response) -> requests.Response:
+        """Register an open body so cancel() can abort it"""
+        with task._bytes_lock:
+            task._responses.append(response)
+        # A cancel that raced the request has already swept the list
+        if task.cancel_requested:
+            self._abort_response(response)
+        return response
+    
+    def _abort_response(self, response: requests.Response):
+        """Close a response from another thread, waking a read blocked on its socket
+        
+        close() alone leaves a recv() already waiting on the socket blocked
+        until the read timeout; shutting the socket down returns it at once.
+        """
+        sock = getattr(response.raw.connection, 'sock', None)
+        if sock is not None:
+            try:
+                sock.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass  # Already closed
+        response.close()
+    
+    def _if_range(self, etag: Optional[str], last_modified: Optional[str]) -> Optional[str]:
+        """Validator for If-Range: a strong ETag, else Last-Modified (weak ETags aren't allowed)"""
+        if etag and not etag.startswith('W/'):
+            return etag
+        return last_modified
+    
+    def _is_range_response(self, response: requests.Response, start: int) -> bool:
+        """Whether the server answered with the range starting at start"""
+        return (response.status_code == 206 and
+                response.headers.get('content-range', '').startswith(f'bytes {start}-'))
+    
+    def _iter_resumable(self, task: DownloadTask, response: requests.Response, offset: int,
+                        end: Optional[int], connections: int = 1):
+        """Yield body chunks, re-requesting the rest after a dropped connection
+        
+        ``offset`` is the file position of the body's first byte and ``end``
+        the last byte wanted (None if unknown); a body ending before ``end``
+        counts as dropped. Only uncompressed bodies from servers with range
+        support can resume; otherwise, or once RESUME_BACKOFF is exhausted
+        without progress, the error propagates.
+        """
+        # Resume only from the same version of the file, never splice in a newer one
+        if_range = self._if_range(response.headers.get('etag'), response.headers.get('last-modified'))
+        failures = 0
+        try:
+            while True:
+                resumed_at = offset
+                try:
+                    if response is None:
+                        response = self._get_range(task, offset, end, if_range)
+                        if not self._is_range_response(response, offset):
+                            # Stop resuming; the error below propagates
+                            task.server_capabilities.supports_range_requests = False
+                            raise requests.HTTPError("Server did not honor the resume range")
+                        with task._bytes_lock:
+                            task.resume_count += 1
+                    for chunk in self._iter_body(response, task, connections):
+                        offset += len(chunk)
+                        yield chunk
+                    if end is not None and offset <= end:
+                        # urllib3 1.x doesn't enforce Content-Length, so a clean close can cut a body short
+                        raise ConnectionError(f"Connection closed {end + 1 - offset} bytes short")
+                    return
+                except self.STREAM_ERRORS:
+                    if response is not None:
+                        response.close()
+                        encoding = response.headers.get('content-encoding', 'identity').lower()
+                        if encoding not in ('', 'identity'):
+                            raise  # Decoded offsets don't map onto the encoded body
+                    if offset > resumed_at:
+                        failures = 0  # The last connection made progress
+                    if not task.server_capabilities.supports_range_requests or failures == len(self.RESUME_BACKOFF):
+                        raise
+                    self._interruptible_sleep(task, self.RESUME_BACKOFF[failures])
+                    failures += 1
+                    response = None
+                    if task.cancel_requested:
+                        return
+        finally:
+            if response is not None:
+                response.close()
+    
+    def _update_progress(self, task: DownloadTask, new_bytes: int, elapsed: float):
+        """Fold the bytes received over the last interval into speed, progress and ETA"""
+        # Smooth speed over the last few measurements
+        task.speed = task.add_speed_sample(new_bytes / elapsed)
+        task.chunk_size = self._tuned_chunk_size(task)
+        self._mark_dirty(task)
+        
+        # Calculate progress
+        size = task.file_size
+        if size > 0:
+            downloaded = task.downloaded_bytes
+            task.progress = downloaded / size
+            
+            # Calculate ETA, in whole seconds
+            if task.speed > 0:
+                task.eta = self._format_time(int((size - downloaded) / task.speed))
+            else:
+                task.eta = "Unknown"
+        else:
+            task.progress = 0
+            task.eta = "Unknown"
+    
+    def _open_temp_file(self, path: str, size: int = 0):
+        """Open the temp file for a sequential write with a 1 MiB buffer, reserving size bytes"""
+        # O_NOATIME skips access-time updates on Linux; O_BINARY matters on Windows
+        flags = (os.O_WRONLY | os.O_CREAT | os.O_TRUNC |
+                 getattr(os, 'O_NOATIME', 0) | getattr(os, 'O_BINARY', 0))
+        file = os.fdopen(os.open(path, flags, 0o644), 'wb', buffering=self.WRITE_BUFFER_SIZE)
+        try:
+            if size > 0:
+                self._preallocate(file.fileno(), size)
+            if hasattr(os, 'posix_fadvise'):
+                os.posix_fadvise(file.fileno(), 0, 0, os.POSIX_FADV_SEQUENTIAL)
+        except OSError:
+            file.close()
+            raise
+        return file
+    
+    def _preallocate(self, fd: int, size: int):
+        """Reserve the file's blocks up front so it doesn't grow extent by extent"""
+        if hasattr(os, 'posix_fallocate'):
+            try:
+                os.posix_fallocate(fd, 0, size)
+                return
+            except OSError:
+                pass  # e.g. filesystems without fallocate support
+        os.ftruncate(fd, size)
+    
+    def _iter_body(self, response: requests.Response, task: DownloadTask, connections: int = 1):
+        """Yield the response body in pieces sized by task.chunk_size
+        
+        Identity bodies are read straight from the raw urllib3 stream into a
+        reused buffer; the yielded view is only valid until the next chunk.
+        ``connections`` is how many streams share the task's bandwidth.
+        """
+        raw = response.raw
+        # urllib3 decodes gzip/deflate itself inside read(); identity bodies skip the decoder
+        encoding = response.headers.get('content-encoding', 'identity').lower()
+        raw.decode_content = encoding not in ('', 'identity')
+        if raw.decode_content:
+            # urllib3 1.x can decode more than was asked for, which readinto() can't
+            # fit in a fixed buffer; take the decoded bytes as read() returns them
+            while True:
+                chunk = raw.read(max(task.chunk_size // connections, self.MIN_CHUNK_SIZE))
+                if not chunk:
+                    return
+                yield chunk
+        
+        size = 0
+        while True:
+            # Follow the tuned chunk size; the buffer is only replaced when it changes
+            wanted = max(task.chunk_size // connections, self.MIN_CHUNK_SIZE)
+            if wanted != size:
+                size = wanted
+                buffer = bytearray(size)
+                view = memoryview(buffer)
+            read = raw.readinto(buffer)
+            if not read:
+                break
+            yield view[:read]
+    
+    def _tuned_chunk_size(self, task: DownloadTask) -> int:
+        """Size reads to about 0.1 s of data at the harmonic-mean speed, as a power of two"""
+        samples = task.download_history
+        if not samples or min(samples) <= 0:
+            return self.MIN_CHUNK_SIZE
+        
+        # The harmonic mean leans towards slow samples, so a burst doesn't oversize reads
+        speed = len(samples) / sum(1 / sample for sample in samples)
+        target = 1 << (max(int(speed * 0.1), 2) - 1).bit_length()
+        return max(self.MIN_CHUNK_SIZE, min(self.MAX_CHUNK_SIZE, target))
+    
+    def _mark_dirty(self, task: DownloadTask):
+        """Queue a refresh of the task's row for the UI thread's next flush"""
+        with self._ui_dirty_lock:
+            self._ui_dirty.add(task)
+    
+    def _take_dirty(self) -> set:
+        """Hand the queued tasks to the UI thread, each at most once"""
+        with self._ui_dirty_lock:
+            dirty, self._ui_dirty = self._ui_dirty, set()
+        return dirty
+    
+    def _post_widget(self, task: DownloadTask, key: str, **options):
+        """Queue a widget change from a worker thread for the UI thread to apply"""
+        self._ui_queue.put((task, key, options))
+    
+    def _drain_ui_queue(self, budget: float = UI_QUEUE_BUDGET):
+        """Apply queued widget changes in order until the queue is empty or budget seconds pass"""
+        deadline = time.monotonic() + budget
+        while time.monotonic() < deadline:
+            try:
+                task, key, options = self._ui_queue.get_nowait()
+            except queue.Empty:
+                return
+            if task.ui_elements is not None:
+                self._set_widget(task, key, **options)
+    
+    def _set_widget(self, task: DownloadTask, key: str, **options):
+        """Configure one of the task's widgets, skipping the Tcl call when nothing changed"""
+        if task._last_ui.get(key) != options:
+            widget = task.ui_elements[key]
+            if widget.winfo_exists():
+                widget.configure(**options)
+                task._last_ui[key] = options
+    
+    def _set_progress(self, task: DownloadTask, value: float):
+        """Move the task's progress bar once the value moved by PROGRESS_STEP, or reached an end"""
+        last = task._last_ui.get('progress')
+        if last is None or (value != last and
+                            (abs(value - last) >= self.PROGRESS_STEP or value in (0.0, 1.0))):
+            progress_bar = task.ui_elements['progress_bar']
+            if progress_bar.winfo_exists():
+                progress_bar.set(value)
+                task._last_ui['progress'] = value
     
     def _update_task_ui(self, task: DownloadTask):
         """Update the UI elements for a specific task"""
-        if not hasattr(task, 'ui_elements'):
+        if task.ui_elements is None:
             return
         
         try:
-            ui = task.ui_elements
-            
             # Update progress bar
-            ui['progress_bar'].set(task.progress)
+            self._set_progress(task, task.progress)
             
             # Update status based on task status
             if task.status == "Downloading":
+                # Rows can be flushed again without new bytes; skip rebuilding the same text
+                inputs = (task.downloaded_bytes, task.speed, task.eta)
+                if task._last_ui.get('downloading') == inputs:
+                    return
+                task._last_ui['downloading'] = inputs
+                
+                downloaded_str = self._format_bytes(task.downloaded_bytes)
+                speed_str = self._format_cached(task, 'speed', task.speed)
                 if task.file_size > 0:
-                    downloaded_str = self._format_bytes(task.downloaded_bytes)
-                    total_str = self._format_bytes(task.file_size)
-                    speed_str = self._format_bytes(task.speed) + "/s"
-                    progress_percent = int(task.progress * 100)
-                    
-                    status_text = f"{downloaded_str} / {total_str} ({progress_percent}%) • {speed_str} • ETA: {task.eta}"
+                    total_str = self._format_cached(task, 'size', task.file_size)
+                    progress_percent = task.downloaded_bytes * 100 // task.file_size
+                    status_text = _STATUS_FMT % (downloaded_str, total_str, progress_percent, speed_str, task.eta)
                 else:
-                    downloaded_str = self._format_bytes(task.downloaded_bytes)
-                    speed_str = self._format_bytes(task.speed) + "/s"
-                    status_text = f"{downloaded_str} downloaded • {speed_str}"
+                    status_text = _STATUS_FMT_NO_SIZE % (downloaded_str, speed_str)
                 
-                ui['status_label'].configure(text=status_text)
-                ui['status_indicator'].configure(
+                self._set_widget(task, 'status_label', text=status_text)
+                self._set_widget(task, 'status_indicator',
                     text="⬇ Downloading",
                     text_color=TorrentLiteColors.SEA_BLUE
                 )
             
             elif task.status == "Complete":
                 if task.file_size > 0:
-                    size_str = self._format_bytes(task.file_size)
-                    ui['status_label'].configure(text=f"✅ Completed • {size_str}")
+                    size_str = self._format_cached(task, 'size', task.file_size)
+                    self._set_widget(task, 'status_label', text=f"✅ Completed • {size_str}")
                 else:
-                    ui['status_label'].configure(text="✅ Download completed")
+                    self._set_widget(task, 'status_label', text="✅ Download completed")
                 
-                ui['status_indicator'].configure(
+                self._set_widget(task, 'status_indicator',
                     text="✅ Complete",
                     text_color=TorrentLiteColors.SUCCESS_GREEN
                 )
                 
                 # Disable controls
-                ui['cancel_btn'].configure(state="disabled")
+                self._set_widget(task, 'cancel_btn', state="disabled")
             
             elif task.status == "Error":
-                ui['status_label'].configure(text=f"❌ Error: {task.error_message}")
-                ui['status_indicator'].configure(
+                self._set_widget(task, 'status_label', text=f"❌ Error: {task.error_message}")
+                self._set_widget(task, 'status_indicator',
                     text="❌ Error",
                     text_color=TorrentLiteColors.ERROR_RED
                 )
             
+            elif task.status == "Paused":
+                self._set_widget(task, 'status_label', text="❌ Cancelled by user")
+                self._set_widget(task, 'status_indicator',
+                    text="❌ Cancelled",
+                    text_color=TorrentLiteColors.ERROR_RED
+                )
+                self._set_widget(task, 'cancel_btn', state="disabled")
+            
             elif task.status == "Analyzing":
-                ui['status_label'].configure(text="🔍 Analyzing server capabilities...")
-                ui['status_indicator'].configure(
+                self._set_widget(task, 'status_label', text="🔍 Analyzing server capabilities...")
+                self._set_widget(task, 'status_indicator',
                     text="🔍 Analyzing",
                     text_color=TorrentLiteColors.WARNING_ORANGE
                 )
@@ -949,36 +1495,31 @@ class DownloadManager:
         except Exception:
             pass  # Ignore UI update errors
     
+    def _format_cached(self, task: DownloadTask, key: str, value: float) -> str:
+        """_format_bytes(value), reusing the task's last result while the value is unchanged"""
+        cached = task._formatted.get(key)
+        if cached is None or cached[0] != value:
+            cached = task._formatted[key] = (value, self._format_bytes(value))
+        return cached[1]
+    
     def _format_bytes(self, bytes_value: float) -> str:
         """Format bytes into human readable format"""
-        if bytes_value == 0:
-            return "0 B"
-        
-        units = ['B', 'KB', 'MB', 'GB', 'TB']
-        unit_index = 0
-        size = float(bytes_value)
-        
-        while size >= 1024 and unit_index < len(units) - 1:
-            size /= 1024
-            unit_index += 1
-        
+        # Each unit is 10 more bits, so the bit length picks the unit without a loop
+        unit_index = min(max(int(bytes_value).bit_length() - 1, 0) // 10, len(_UNITS) - 1)
         if unit_index == 0:
-            return f"{int(size)} {units[unit_index]}"
-        else:
-            return f"{size:.1f} {units[unit_index]}"
+            return f"{int(bytes_value)} B"
+        return f"{bytes_value / _DIVISORS[unit_index]:.1f} {_UNITS[unit_index]}"
     
     def _format_time(self, seconds: float) -> str:
         """Format seconds into human readable time"""
+        seconds = int(seconds)
         if seconds < 60:
-            return f"{int(seconds)}s"
-        elif seconds < 3600:
-            minutes = int(seconds // 60)
-            secs = int(seconds % 60)
+            return f"{seconds}s"
+        minutes, secs = divmod(seconds, 60)
+        if minutes < 60:
             return f"{minutes}m {secs}s"
-        else:
-            hours = int(seconds // 3600)
-            minutes = int((seconds % 3600) // 60)
-            return f"{hours}h {minutes}m"
+        hours, minutes = divmod(minutes, 60)
+        return f"{hours}h {minutes}m"
 
 def main():
     """Main application entry point"""